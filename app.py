@@ -1,13 +1,16 @@
 import os
+import time
 import uuid
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict
 
 import streamlit as st
 from streamlit_mic_recorder import mic_recorder
-import entxp
-from frontend.bedrock_agent import call_master_agent as call_master_agent_text, synthesize_voice
-from voice_pipeline import handle_voice_interaction
+
+# NOTE: entxp / frontend.bedrock_agent / voice_pipeline are imported lazily
+# inside the pages that use them — they pull in boto3/botocore, which costs
+# hundreds of ms of cold-start that the Home page doesn't need.
 
 # Page config
 st.set_page_config(page_title="SparkPath OS", layout="wide")
@@ -17,6 +20,23 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 AUDIO_DIR = os.path.join(BASE_DIR, "audio_cache")
 os.makedirs(AUDIO_DIR, exist_ok=True)
 
+# Every recording lands in audio_cache with a fresh UUID name, so without a
+# cap the directory grows forever. Keep only the newest files.
+AUDIO_CACHE_MAX_FILES = 100
+
+
+def _prune_audio_cache(max_files: int = AUDIO_CACHE_MAX_FILES) -> None:
+    """Delete the oldest files in AUDIO_DIR beyond max_files."""
+    try:
+        entries = sorted(os.scandir(AUDIO_DIR), key=lambda e: e.stat().st_mtime)
+    except OSError:
+        return
+    for entry in entries[: max(0, len(entries) - max_files)]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
 # -----------------------------------
 # Read query params to handle "go next"
 # -----------------------------------
@@ -30,38 +50,9 @@ if params.get("next", ["false"])[0].lower() == "true":
 # -----------------------------------
 # Avatar Selector Page
 # -----------------------------------
-def avatar_selector_page():
-    st.title("🎨 Talent X AI")
 
-    avatar_options = {
-        "A dancer": "https://models.readyplayer.me/6917ea365f9f523e500b3e38.glb",
-        "A music producer": "https://models.readyplayer.me/6917f36b672cca15c2f8b45b.glb",
-        "A film director": "https://models.readyplayer.me/6917f1a648062250a41a8134.glb",
-        "A gamer": "https://models.readyplayer.me/6917e5f7132e61458ccd4798.glb",
-        "A fashion influencer": "https://models.readyplayer.me/6917ed4628f4be8b0cd2b12a.glb",
-        "Don't know yet": "https://models.readyplayer.me/placeholder.glb"
-    }
-    emoji_icons = {
-        "A dancer": "🕺",
-        "A music producer": "🎧",
-        "A film director": "🎬",
-        "A gamer": "🎮",
-        "A fashion influencer": "👗",
-        "Don't know yet": "❓"
-    }
-
-    if "selected" not in st.session_state:
-        st.session_state.selected = "A fashion influencer"
-
-    selected = st.session_state.selected
-    labels = list(avatar_options.keys())
-    positions = [(-350, 60), (-200, 10), (-50, -20), (100, -20), (250, 10), (400, 60)]
-    center_index = len(labels) // 2
-    labels.remove(selected)
-    labels.insert(center_index, selected)
-
-    # Build HTML
-    html = """
+# Static CSS / script blocks never change, so build them once at import.
+_AVATAR_STATIC_CSS = """
     <style>
       body { background:#0a0420; color:white; font-family:Inter,sans-serif; }
       .arc-container { position: relative; width: 100%; height: 360px; margin-top: 20px;
@@ -77,50 +68,114 @@ def avatar_selector_page():
                      box-shadow: 0 0 38px #6cf3ff; overflow: hidden;
                      position: relative; top: -40px; cursor: pointer; }
     </style>
+"""
 
-    <div class="arc-container">
+_MODEL_VIEWER_SCRIPT = (
+    '<script type="module" '
+    'src="https://unpkg.com/@google/model-viewer/dist/model-viewer.min.js"></script>'
+)
+
+
+# Truly static avatar data lives at module scope — nothing here depends on
+# session state, so there is no reason to rebuild it per call.
+_AVATAR_OPTIONS = {
+    "A dancer": "https://models.readyplayer.me/6917ea365f9f523e500b3e38.glb",
+    "A music producer": "https://models.readyplayer.me/6917f36b672cca15c2f8b45b.glb",
+    "A film director": "https://models.readyplayer.me/6917f1a648062250a41a8134.glb",
+    "A gamer": "https://models.readyplayer.me/6917e5f7132e61458ccd4798.glb",
+    "A fashion influencer": "https://models.readyplayer.me/6917ed4628f4be8b0cd2b12a.glb",
+    "Don't know yet": "https://models.readyplayer.me/placeholder.glb"
+}
+_EMOJI_ICONS = {
+    "A dancer": "🕺",
+    "A music producer": "🎧",
+    "A film director": "🎬",
+    "A gamer": "🎮",
+    "A fashion influencer": "👗",
+    "Don't know yet": "❓"
+}
+_POSITIONS = [(-350, 60), (-200, 10), (-50, -20), (100, -20), (250, 10), (400, 60)]
+_LABELS = list(_AVATAR_OPTIONS)
+_CENTER_INDEX = len(_LABELS) // 2
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _build_avatar_html(selected: str) -> str:
+    """
+    Assemble the full avatar-selector HTML for the given center avatar.
+    There are only six possible selections, so each payload is built once
+    per process instead of on every rerun.
     """
-    for (label, (x, y)) in zip(labels, positions):
-        html += f"""
+    # Rebuild the order with slices — _LABELS is shared, never mutate it.
+    rest = [label for label in _LABELS if label != selected]
+    labels = rest[:_CENTER_INDEX] + [selected] + rest[_CENTER_INDEX:]
+
+    avatars_html = "\n".join(
+        f"""
         <div style="position:absolute; left:calc(50% + {x}px); top:{y}px; text-align:center;">
           <div class='avatar'
-               onmouseover="document.getElementById('model').src='{avatar_options[label]}';">
-            {emoji_icons[label]}
+               onmouseover="document.getElementById('model').src='{_AVATAR_OPTIONS[label]}';">
+            {_EMOJI_ICONS[label]}
           </div>
           <div class="role-label">{label}</div>
         </div>
         """
+        for (label, (x, y)) in zip(labels, _POSITIONS)
+    )
+
+    return f"""
+    {_AVATAR_STATIC_CSS}
 
-    html += "</div>"
+    <div class="arc-container">
+    {avatars_html}
+    </div>
 
-    # Center glow model
-    html += f"""
     <div class="center-glow">
-      <model-viewer id="model" src="{avatar_options[selected]}"
+      <model-viewer id="model" src="{_AVATAR_OPTIONS[selected]}"
                     auto-rotate camera-controls
                     style="width:100%; height:100%;">
       </model-viewer>
     </div>
 
-    <script type="module" src="https://unpkg.com/@google/model-viewer/dist/model-viewer.min.js"></script>
+    {_MODEL_VIEWER_SCRIPT}
     """
 
+
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for background work like TTS synthesis."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def _flag_go_next():
+    st.session_state.go_next = True
+
+
+def avatar_selector_page():
+    st.title("🎨 Talent X AI")
+
+    if "selected" not in st.session_state:
+        st.session_state.selected = "A fashion influencer"
+
     # Render the avatar HTML
-    st.components.v1.html(html, height=800)
+    st.components.v1.html(_build_avatar_html(st.session_state.selected), height=800)
 
     # -------------------------------------------------
     # Hidden button below the center avatar
     # -------------------------------------------------
     st.markdown("<br>", unsafe_allow_html=True)  # small spacing
-    if st.button("→", key="goto_voice_copilot"):
-        st.session_state.go_next = True
-        st.experimental_rerun()
+    # on_click runs before the next script run, so the flag is visible to
+    # main() without forcing an extra rerun.
+    st.button("→", key="goto_voice_copilot", on_click=_flag_go_next)
 
 
 # =====================================================================
 # Voice Copilot
 # =====================================================================
 def voice_copilot_tab():
+    from frontend.bedrock_agent import call_master_agent as call_master_agent_text, synthesize_voice
+    from voice_pipeline import handle_voice_interaction
+
     st.title("🎤 SparkPath – Voice Career Copilot")
 
     if "session_id" not in st.session_state:
@@ -129,57 +184,108 @@ def voice_copilot_tab():
         st.session_state.history = []
 
     session_id = st.session_state.session_id
+
+    # Button handlers as on_click callbacks: Streamlit runs them *before*
+    # the script body of the rerun the click triggers, so the new state is
+    # already visible when the page renders — no st.experimental_rerun()
+    # storm needed afterwards.
+    def _reset_conversation():
+        st.session_state.history = []
+        st.session_state.session_id = str(uuid.uuid4())
+
+    def _send_typed_message():
+        user_text = st.session_state.typed_input
+        if not user_text.strip():
+            return
+        st.session_state.history.append({"role": "user", "text": user_text, "audio_path": None})
+        agent_reply = call_master_agent_text(user_text, user_id=session_id)
+        # Kick TTS off in the background so the text reply renders right
+        # away; the audio attaches to the turn once the future resolves.
+        st.session_state.history.append(
+            {
+                "role": "agent",
+                "text": agent_reply,
+                "audio_path": None,
+                "audio_bytes": None,
+                "audio_future": _get_executor().submit(synthesize_voice, agent_reply),
+            }
+        )
+
+    def _send_voice_message(audio_bytes: bytes):
+        with st.spinner("…"):
+            user_audio_path = os.path.join(AUDIO_DIR, f"{uuid.uuid4()}_user.wav")
+            Path(user_audio_path).write_bytes(audio_bytes)
+            _prune_audio_cache()
+
+            reply_audio_path = os.path.join(AUDIO_DIR, f"{uuid.uuid4()}_reply.mp3")
+            try:
+                user_text, agent_reply, final_audio = handle_voice_interaction(
+                    user_audio_path, reply_audio_path, session_id
+                )
+            except ValueError as e:
+                # e.g. the clip was too short to transcribe — tell the
+                # user instead of surfacing a traceback.
+                st.warning(str(e))
+                return
+            if not final_audio:
+                final_audio = reply_audio_path
+            st.session_state.history.append({"role": "user", "text": user_text or "(…)", "audio_path": None})
+            st.session_state.history.append(
+                {
+                    "role": "agent",
+                    "text": agent_reply or "(…)",
+                    "audio_path": final_audio,
+                    "audio_ok": bool(final_audio) and os.path.exists(final_audio),
+                }
+            )
+
     st.subheader("💬 Conversation")
     for turn in st.session_state.history:
         label = "🧑 You" if turn["role"] == "user" else "🎬 Agent"
         st.markdown(f"**{label}:** {turn['text']}")
-        if turn.get("audio_path") and os.path.exists(turn["audio_path"]):
-            st.audio(turn["audio_path"], format="audio/mp3")
+        future = turn.get("audio_future")
+        if future is not None and future.done():
+            try:
+                turn["audio_bytes"] = future.result()
+            except Exception:
+                pass
+            turn["audio_future"] = None
+        if turn.get("audio_bytes"):
+            st.audio(turn["audio_bytes"], format="audio/mp3")
+        elif turn.get("audio_ok"):
+            # audio_ok was set at append time, but _prune_audio_cache may
+            # have deleted the file since — re-check before playing, and
+            # clear the flag so a pruned file is never stat()ed again.
+            if os.path.exists(turn["audio_path"]):
+                st.audio(turn["audio_path"], format="audio/mp3")
+            else:
+                turn["audio_ok"] = False
 
     st.markdown("---")
-    if st.button("🔁 Reset conversation"):
-        st.session_state.history = []
-        st.session_state.session_id = str(uuid.uuid4())
-        st.experimental_rerun()
+    st.button("🔁 Reset conversation", on_click=_reset_conversation)
 
-    user_text = st.text_input("Type your message:", key="typed_input")
-    if st.button("Send text"):
-        if user_text.strip():
-            st.session_state.history.append({"role": "user", "text": user_text, "audio_path": None})
-            agent_reply = call_master_agent_text(user_text, user_id=session_id)
-            try:
-                audio_bytes = synthesize_voice(agent_reply)
-                temp_audio = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-                temp_audio.write(audio_bytes)
-                reply_audio_path = temp_audio.name
-            except Exception as e:
-                reply_audio_path = None
-            st.session_state.history.append({"role": "agent", "text": agent_reply, "audio_path": reply_audio_path})
-            st.experimental_rerun()
+    # Form so typing doesn't rerun the script per keystroke — only Send does.
+    with st.form("typed_message_form", clear_on_submit=False):
+        st.text_input("Type your message:", key="typed_input")
+        st.form_submit_button("Send text", on_click=_send_typed_message)
 
     st.markdown("---")
     st.markdown("### 🎤 Speak your message")
     audio = mic_recorder(start_prompt="🎙️ Start recording", stop_prompt="🛑 Stop", key="mic1")
     if audio:
         st.success("Recording captured!")
-        if st.button("Send voice to agent"):
-            with st.spinner("…"):
-                user_audio_path = os.path.join(AUDIO_DIR, f"{uuid.uuid4()}_user.wav")
-                with open(user_audio_path, "wb") as f:
-                    f.write(audio["bytes"])
-
-                reply_audio_path = os.path.join(AUDIO_DIR, f"{uuid.uuid4()}_reply.mp3")
-                user_text, agent_reply, final_audio = handle_voice_interaction(
-                    user_audio_path, reply_audio_path, session_id
-                )
-                if not final_audio:
-                    final_audio = reply_audio_path
-                st.session_state.history.append({"role": "user", "text": user_text or "(…)", "audio_path": None})
-                st.session_state.history.append({"role": "agent", "text": agent_reply or "(…)", "audio_path": final_audio})
-                st.experimental_rerun()
+        st.button("Send voice to agent", on_click=_send_voice_message, args=(audio["bytes"],))
     else:
         st.caption("Press **Start recording**, speak, then press **Stop**.")
 
+    # Poll outstanding TTS futures from the end of the script (same
+    # pattern as spark_main's identity poll): keep rerunning until the
+    # render loop has resolved them all, so the audio player appears when
+    # synthesis finishes rather than on the next unrelated interaction.
+    if any(turn.get("audio_future") is not None for turn in st.session_state.history):
+        time.sleep(0.5)
+        st.rerun()
+
 # =====================================================================
 # MAIN NAVIGATION
 # =====================================================================
@@ -204,8 +310,10 @@ def main():
     if choice == "🎨 Home":
         avatar_selector_page()
     elif choice == "🎬 Day-in-the-Life Simulation":
+        import entxp
         entxp.ent_main()
     elif choice == "✨ Spark Hub":
+        import entxp
         entxp.spark_main()
     else:
         voice_copilot_tab()
@@ -1,7 +1,51 @@
+import hashlib
 import json
+import logging
+import os
+import re
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError, ParamValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_loads(data):
+    """orjson.loads when available (2–5× faster), stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> str:
+    """Compact JSON string via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _json_dumps_sorted(obj) -> str:
+    """
+    Compact JSON string with sorted keys, via orjson when available.
+    Sorting makes logically identical payloads serialize identically —
+    the string doubles as the cache key for the AI-response cache.
+    Compact (no indent) because whitespace in the prompt payload is
+    billed as input tokens on every cache miss.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
 
 # ============================
 # PAGE CONFIG (GLOBAL)
@@ -10,35 +54,191 @@ from botocore.config import Config
 BEDROCK_REGION = "us-east-1"
 BEDROCK_MODEL_ID = "meta.llama3-8b-instruct-v1:0"
 
-bedrock_runtime = boto3.client(
-    "bedrock-runtime",
-    region_name=BEDROCK_REGION,
-    config=Config(read_timeout=60, retries={"max_attempts": 3}),
-)
+# Latency-optimized inference roughly halves TTFT/TPOT on supported
+# model/region combos; set BEDROCK_LATENCY=standard to opt out. Calls fall
+# back to the standard path automatically where the param is rejected.
+BEDROCK_LATENCY = os.environ.get("BEDROCK_LATENCY", "optimized")
+
+@st.cache_resource
+def get_bedrock_client():
+    """
+    Bedrock runtime client, created once per process and shared across all
+    sessions (it holds the HTTPS connection pool, so rebuilding it costs a
+    TLS handshake per call).
+    """
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=BEDROCK_REGION,
+        config=Config(
+            read_timeout=60,
+            retries={"max_attempts": 3},
+            max_pool_connections=32,
+        ),
+    )
+
+
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for background Bedrock prefetches."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+# Singleflight bookkeeping: while a prompt's first call is in flight (and
+# therefore not yet in st.cache_data), concurrent identical calls wait for
+# it instead of issuing duplicate Bedrock requests.
+_inflight_lock = threading.Lock()
+_inflight = {}  # prompt digest -> {"event": Event, "result"/"error": ...}
 
 
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False, max_entries=256)
 def call_bedrock(prompt: str, max_tokens: int = 800, temperature: float = 0.7) -> str:
     """
     Shared Bedrock call for Llama 3-style models.
     Uses schema: prompt / max_gen_len / temperature.
     Returns raw text generation string.
+
+    Cached by (prompt, max_tokens, temperature): Streamlit reruns the whole
+    script on every widget interaction, so identical prompts would otherwise
+    re-hit Bedrock on each rerun. In-flight duplicates are coalesced so a
+    burst of identical submissions costs exactly one Bedrock call.
+    """
+    key = hashlib.blake2b(
+        f"{max_tokens}|{temperature}|{prompt}".encode("utf-8")
+    ).hexdigest()
+
+    with _inflight_lock:
+        entry = _inflight.get(key)
+        leader = entry is None
+        if leader:
+            entry = {"event": threading.Event()}
+            _inflight[key] = entry
+
+    if not leader:
+        entry["event"].wait()
+        if "error" in entry:
+            raise entry["error"]
+        return entry["result"]
+
+    try:
+        entry["result"] = _invoke_bedrock(prompt, max_tokens, temperature)
+        return entry["result"]
+    except Exception as e:
+        entry["error"] = e
+        raise
+    finally:
+        entry["event"].set()
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _latency_config_rejected(exc) -> bool:
+    """
+    True when the error means the model/region rejected the latency
+    config itself — the only case worth retrying without it. Throttling,
+    auth and transport errors must propagate, not double the call count.
+    """
+    if isinstance(exc, ParamValidationError):
+        return True
+    return (
+        isinstance(exc, ClientError)
+        and exc.response.get("Error", {}).get("Code") == "ValidationException"
+    )
+
+
+# Model families with Bedrock prompt-caching support; cachePoint blocks are
+# rejected elsewhere, so gate on the configured model id.
+_PROMPT_CACHE_MODEL_PREFIXES = ("anthropic.claude-3-5", "anthropic.claude-3-7", "amazon.nova")
+
+
+def _supports_prompt_cache(model_id: str) -> bool:
+    return model_id.startswith(_PROMPT_CACHE_MODEL_PREFIXES)
+
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False, max_entries=256, persist="disk")
+def call_bedrock_converse(system_text: str, user_text: str,
+                          max_tokens: int = 800, temperature: float = 0.7) -> str:
     """
+    Bedrock call via the Converse API with the static instructions as a
+    system block. When the model supports prompt caching, a cachePoint
+    checkpoint is placed right after the instructions so repeated calls
+    reuse the server-side prefix cache and only pay for the small user
+    payload. The instructions must stay byte-identical across calls for
+    the cache to hit — keep them in module constants.
+
+    Results persist to disk, so identical lab submissions are served from
+    cache across reruns, sessions and even app restarts.
+    """
+    system = [{"text": system_text}]
+    if _supports_prompt_cache(BEDROCK_MODEL_ID):
+        system.append({"cachePoint": {"type": "default"}})
+
+    kwargs = dict(
+        modelId=BEDROCK_MODEL_ID,
+        system=system,
+        messages=[{"role": "user", "content": [{"text": user_text}]}],
+        inferenceConfig={"maxTokens": max_tokens, "temperature": temperature},
+    )
+    if BEDROCK_LATENCY != "standard":
+        kwargs["performanceConfig"] = {"latency": BEDROCK_LATENCY}
+
+    try:
+        response = get_bedrock_client().converse(**kwargs)
+    except (ParamValidationError, ClientError) as e:
+        if "performanceConfig" not in kwargs or not _latency_config_rejected(e):
+            raise
+        kwargs.pop("performanceConfig")
+        response = get_bedrock_client().converse(**kwargs)
+
+    usage = response.get("usage", {})
+    logger.debug(
+        "Bedrock converse usage: %s (cacheRead=%s cacheWrite=%s)",
+        usage,
+        usage.get("cacheReadInputTokens"),
+        usage.get("cacheWriteInputTokens"),
+    )
+    return response["output"]["message"]["content"][0]["text"]
+
+
+def _invoke_bedrock(prompt: str, max_tokens: int, temperature: float) -> str:
+    """The actual (uncached, uncoalesced) Bedrock invocation."""
     body = {
         "prompt": prompt,
         "max_gen_len": max_tokens,
         "temperature": temperature,
     }
 
-    response = bedrock_runtime.invoke_model(
+    kwargs = dict(
         modelId=BEDROCK_MODEL_ID,
-        body=json.dumps(body),
+        body=_json_dumps(body),
     )
+    if BEDROCK_LATENCY != "standard":
+        kwargs["performanceConfigLatency"] = BEDROCK_LATENCY
 
-    response_body = json.loads(response["body"].read())
-    generation = response_body.get("generation", "")
-    print("\n=== Bedrock raw generation ===")
-    print(generation)
-    print("=== End generation ===\n")
+    try:
+        response = get_bedrock_client().invoke_model_with_response_stream(**kwargs)
+    except (ParamValidationError, ClientError) as e:
+        if "performanceConfigLatency" not in kwargs or not _latency_config_rejected(e):
+            raise
+        kwargs.pop("performanceConfigLatency")
+        response = get_bedrock_client().invoke_model_with_response_stream(**kwargs)
+
+    # Stream the generation so the user sees progress within a few hundred
+    # ms (time to first token) instead of a blank spinner until the full
+    # response lands. The JSON is still parsed only once, at stream end.
+    placeholder = st.empty()
+    pieces = []
+    for event in response.get("body", []):
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        delta = _json_loads(chunk["bytes"]).get("generation", "")
+        if delta:
+            pieces.append(delta)
+            placeholder.caption(f"✍️ Writing your story… ({sum(len(p) for p in pieces)} characters)")
+    placeholder.empty()
+
+    generation = "".join(pieces)
+    logger.debug("Bedrock raw generation:\n%s", generation)
     return generation
 
 
@@ -46,44 +246,100 @@ def call_bedrock(prompt: str, max_tokens: int = 800, temperature: float = 0.7) -
 # JSON HELPER (SHARED)
 # ============================
 
-def safe_json_from_model(raw: str):
+def _find_balanced(raw: str, open_char: str, close_char: str):
+    """
+    Return the first balanced `open_char ... close_char` substring of raw,
+    or None. Single linear pass tracking nesting depth, with a small
+    string/escape state machine so brackets inside JSON string literals
+    don't count.
+    """
+    start = raw.find(open_char)
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i in range(start, len(raw)):
+        ch = raw[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == open_char:
+            depth += 1
+        elif ch == close_char:
+            depth -= 1
+            if depth == 0:
+                return raw[start: i + 1]
+
+    return None
+
+
+# Llama 3 almost always emits either clean JSON or one fenced block, so a
+# single compiled regex match covers the common path before we fall back
+# to Python-level scanning.
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.+?)\s*```", re.DOTALL)
+_OBJ_RE = re.compile(r"(\{.*\}|\[.*\])", re.DOTALL)
+
+
+def safe_json_from_model(raw):
     """
-    Try to extract JSON (list or object) from the raw model string.
-    Handles:
+    Try to extract JSON (list or object) from raw model output (str or
+    bytes). Handles:
     - prose around JSON,
     - ``` fenced blocks,
     - appended markdown.
     """
+    # 1) direct parse — orjson takes bytes as-is, so on the happy path a
+    # bytes payload never gets decoded at all.
+    try:
+        return _json_loads(raw)
+    except Exception:
+        pass
+
+    # The recovery passes below are regex/scanner based and need text.
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8", errors="replace")
     raw = raw.strip()
 
-    # 1) direct parse
     try:
-        return json.loads(raw)
+        return _json_loads(raw)
     except Exception:
         pass
 
     # 2) inside ``` fences
-    if "```" in raw:
-        parts = raw.split("```")
-        for part in parts:
-            candidate = part.strip()
-            if candidate.startswith("[") or candidate.startswith("{"):
-                try:
-                    return json.loads(candidate)
-                except Exception:
-                    continue
-
-    # 3) shortest substring starting at '[' or '{'
+    m = _FENCE_RE.search(raw)
+    if m:
+        candidate = m.group(1)
+        if candidate.startswith("[") or candidate.startswith("{"):
+            try:
+                return _json_loads(candidate)
+            except Exception:
+                pass
+
+    # 3) widest bare object / list span
+    m = _OBJ_RE.search(raw)
+    if m:
+        try:
+            return _json_loads(m.group(1))
+        except Exception:
+            pass
+
+    # 4) first balanced substring starting at '[' or '{'
     for open_char, close_char in [("[", "]"), ("{", "}")]:
-        start = raw.find(open_char)
-        if start != -1:
-            for end in range(start + 1, len(raw)):
-                if raw[end] == close_char:
-                    candidate = raw[start: end + 1]
-                    try:
-                        return json.loads(candidate)
-                    except Exception:
-                        continue
+        candidate = _find_balanced(raw, open_char, close_char)
+        if candidate is not None:
+            try:
+                return _json_loads(candidate)
+            except Exception:
+                continue
 
     raise ValueError("Could not extract JSON from model output.")
 
@@ -110,19 +366,22 @@ def ent_go_to(stage: str):
     st.session_state.ent_stage = stage
 
 
+def ent_pick_role(role: dict):
+    st.session_state.ent_selected_role = role
+    st.session_state.ent_stage = "simulation"
+
+
 # ---- ENT.XP HELPERS ----
 
-def ent_generate_role_options_from_ai(profile_text: str):
-    """
-    Asks Bedrock to generate 3–5 roles in JSON.
-    If anything fails, uses fallback roles.
-    """
-    prompt = f"""
+# Prompt bodies are built once at import as string.Template constants —
+# only the small dynamic slot is substituted per call. Template avoids
+# the {{ }} brace-escaping the JSON examples would need with str.format.
+_ROLE_PROMPT_TMPL = string.Template("""
 You are a friendly career mentor helping youth discover hidden entertainment careers.
 
 The user profile is:
 
-{profile_text}
+$profile_text
 
 Your task:
 Suggest EXACTLY 3 to 5 creative entertainment career roles this person might enjoy.
@@ -134,7 +393,15 @@ Each item MUST have:
 - "role_name"
 - "one_sentence_hook"
 - "why_it_fits_this_person"
-"""
+""")
+
+
+def ent_generate_role_options_from_ai(profile_text: str):
+    """
+    Asks Bedrock to generate 3–5 roles in JSON.
+    If anything fails, uses fallback roles.
+    """
+    prompt = _ROLE_PROMPT_TMPL.substitute(profile_text=profile_text)
 
     try:
         raw = call_bedrock(prompt)
@@ -146,7 +413,7 @@ Each item MUST have:
         raise ValueError("Parsed roles list is empty.")
 
     except Exception as e:
-        print("ENT.XP Bedrock / JSON error (roles):", repr(e))
+        logger.warning("ENT.XP Bedrock / JSON error (roles): %r", e)
         st.toast("Using fallback roles (AI error).", icon="⚠️")
 
     return [
@@ -168,28 +435,23 @@ Each item MUST have:
     ]
 
 
-def ent_generate_day_simulation(role_name: str, fit_reason: str):
-    """
-    Ask Bedrock to generate a 'day in the life' JSON object for a role.
-    Returns a dict with: scenes, key_tasks, key_challenges, growth_path.
-    """
-    prompt = f"""
+_DAY_SIM_PROMPT_TMPL = string.Template("""
 You are designing a realistic 'day in the life' story for a youth exploring an entertainment career.
 
-Role: {role_name}
+Role: $role_name
 
 Why this role fits them:
-{fit_reason}
+$fit_reason
 
 Create a typical workday from morning to evening, as JSON with this structure:
 
-{{
+{
   "scenes": [
-    {{
+    {
       "time_of_day": "9:15 AM",
       "short_title": "Kickoff in the studio lobby",
       "narration": "You grab a coffee and review today's plan with the producer."
-    }},
+    },
     ...
   ],
   "key_tasks": [
@@ -205,7 +467,7 @@ Create a typical workday from morning to evening, as JSON with this structure:
     "Year 3: ...",
     "Year 5: ..."
   ]
-}}
+}
 
 Guidelines:
 - Make 6 to 8 scenes.
@@ -214,7 +476,19 @@ Guidelines:
 - Focus on realistic, not glamorous-only moments.
 
 Reply ONLY with that JSON object. No extra text.
-"""
+""")
+
+
+@st.cache_data(ttl=7 * 24 * 3600, max_entries=512, show_spinner=False)
+def ent_generate_day_simulation(role_name: str, fit_reason: str):
+    """
+    Ask Bedrock to generate a 'day in the life' JSON object for a role.
+    Returns a dict with: scenes, key_tasks, key_challenges, growth_path.
+
+    Cached across sessions (not just session_state), so a popular role is
+    generated once per process rather than once per user/reload.
+    """
+    prompt = _DAY_SIM_PROMPT_TMPL.substitute(role_name=role_name, fit_reason=fit_reason)
 
     try:
         raw = call_bedrock(prompt)
@@ -229,7 +503,7 @@ Reply ONLY with that JSON object. No extra text.
         return sim
 
     except Exception as e:
-        print("ENT.XP Bedrock / JSON error (simulation):", repr(e))
+        logger.warning("ENT.XP Bedrock / JSON error (simulation): %r", e)
         st.toast("Could not generate full simulation, showing a simple summary.", icon="⚠️")
 
         return {
@@ -268,8 +542,162 @@ Reply ONLY with that JSON object. No extra text.
         }
 
 
+_ALL_SIMS_PROMPT_TMPL = string.Template("""
+You are designing realistic 'day in the life' stories for a youth exploring entertainment careers.
+
+Here are the roles, with why each fits them:
+
+$role_lines
+
+For EVERY role above, create a typical workday from morning to evening.
+
+Reply ONLY with a single JSON object mapping each role name to its simulation:
+
+{
+  "<role name exactly as given>": {
+    "scenes": [
+      {
+        "time_of_day": "9:15 AM",
+        "short_title": "Kickoff in the studio lobby",
+        "narration": "You grab a coffee and review today's plan with the producer."
+      },
+      ...
+    ],
+    "key_tasks": ["Short bullet about an important task", "Another key task"],
+    "key_challenges": ["Short bullet about a real challenge", "Another challenge"],
+    "growth_path": ["Year 1: ...", "Year 3: ...", "Year 5: ..."]
+  },
+  ...
+}
+
+Guidelines:
+- Make 4 to 6 scenes per role.
+- Narration should be 1–2 sentences, present tense, second person ("you ...").
+- Keep language simple and encouraging.
+- Focus on realistic, not glamorous-only moments.
+
+Reply ONLY with that JSON object. No extra text.
+""")
+
+
+def ent_generate_all_simulations(roles):
+    """
+    Ask Bedrock for the day simulations of ALL suggested roles in one call,
+    so picking a role later is a local dict lookup instead of another
+    Bedrock round trip. Returns {role_name: sim_dict}; on failure returns
+    an empty dict and the per-role call stays as the fallback.
+    """
+    role_lines = "\n".join(
+        f'- "{role["role_name"]}": {role["why_it_fits_this_person"]}'
+        for role in roles
+    )
+    prompt = _ALL_SIMS_PROMPT_TMPL.substitute(role_lines=role_lines)
+
+    try:
+        raw = call_bedrock(prompt, max_tokens=2000)
+        sims = safe_json_from_model(raw)
+
+        if not isinstance(sims, dict):
+            raise ValueError("Batch simulation JSON is not an object.")
+
+        return {name: sim for name, sim in sims.items() if isinstance(sim, dict)}
+
+    except Exception as e:
+        logger.warning("ENT.XP Bedrock / JSON error (batch simulations): %r", e)
+        return {}
+
+
+def _prefetch_simulation(role_name: str, fit_reason: str):
+    """
+    Warm ent_generate_day_simulation's cache from a worker thread. Runs
+    without a Streamlit script context, so UI side effects may be dropped —
+    errors are logged and the on-click path stays as the fallback.
+    """
+    try:
+        ent_generate_day_simulation(role_name, fit_reason)
+    except Exception as e:
+        logger.debug("ENT.XP simulation prefetch failed for %s: %r", role_name, e)
+
+
 # ---- ENT.XP UI ----
 
+# Card templates as module constants: str.format runs in C and skips
+# rebuilding the big literal on every loop iteration.
+# The card chrome is shared CSS emitted once per render; each card is a
+# compact class-based div, which keeps the websocket payload small when
+# there are several roles.
+_ROLE_CARD_CSS = """
+<style>
+.role-card {
+    background: radial-gradient(circle at top left, #1f2937, #020617);
+    border-radius: 18px;
+    padding: 16px 18px;
+    margin-bottom: 14px;
+    box-shadow: 0 10px 25px rgba(0,0,0,0.35);
+    border: 1px solid rgba(148,163,184,0.35);
+}
+.role-card-top { display:flex; justify-content:space-between; align-items:center; margin-bottom:6px; }
+.role-card-option { font-size:0.8rem; opacity:0.8; }
+.role-card-tag {
+    font-size:0.75rem;
+    padding: 2px 8px;
+    border-radius: 999px;
+    background: rgba(96,165,250,0.15);
+    color:#bfdbfe;
+}
+.role-card-name { font-size: 1.05rem; font-weight: 600; margin-bottom: 4px; }
+.role-card-hook { font-size: 0.92rem; opacity: 0.9; margin-bottom: 6px; }
+.role-card-why { font-size: 0.85rem; opacity: 0.8; }
+.role-card-why b { opacity:0.9; font-weight:500; }
+</style>
+"""
+
+_ROLE_CARD = """
+<div class="role-card">
+    <div class="role-card-top">
+        <span class="role-card-option">Option {idx}</span>
+        <span class="role-card-tag">Entertainment · Creative</span>
+    </div>
+    <div class="role-card-name">{role_name}</div>
+    <div class="role-card-hook">{hook}</div>
+    <div class="role-card-why"><b>Why this fits your spark:</b> {why_fit}</div>
+</div>
+"""
+
+_SCENE_CARD = """
+            <div style="
+                position: relative;
+                border-radius: 16px;
+                padding: 14px 16px 12px 16px;
+                margin-bottom: 12px;
+                background: linear-gradient(135deg, #020617, #111827);
+                border: 1px solid rgba(148,163,184,0.45);
+                box-shadow: 0 8px 20px rgba(0,0,0,0.35);
+            ">
+                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
+                    <div style="font-size:0.78rem; opacity:0.8;">
+                        Scene {i}
+                    </div>
+                    <div style="
+                        font-size:0.78rem;
+                        padding: 2px 8px;
+                        border-radius: 999px;
+                        background: rgba(251,191,36,0.18);
+                        color:#fbbf24;
+                    ">
+                        {time_of_day}
+                    </div>
+                </div>
+                <div style="font-size:0.98rem; font-weight:600; margin-bottom:4px;">
+                    {title}
+                </div>
+                <div style="font-size:0.9rem; line-height:1.4; opacity:0.9;">
+                    {narration}
+                </div>
+            </div>
+"""
+
+
 def ent_show_landing():
     st.markdown(
         """
@@ -310,49 +738,54 @@ def ent_show_landing():
 def ent_show_quiz():
     st.header("Step 1 · Tell us about your spark")
 
-    interests = st.multiselect(
-        "What are you drawn to?",
-        ["Music", "Dance", "Gaming", "Film & Video", "Fashion",
-         "Social Media", "Writing", "Tech & Editing"],
-        key="ent_interests"
-    )
+    # A form batches all the inputs into a single rerun on submit, instead
+    # of rerunning the whole script on every keystroke / selection.
+    with st.form("ent_quiz_form", clear_on_submit=False):
+        interests = st.multiselect(
+            "What are you drawn to?",
+            ["Music", "Dance", "Gaming", "Film & Video", "Fashion",
+             "Social Media", "Writing", "Tech & Editing"],
+            key="ent_interests"
+        )
 
-    work_style = st.radio(
-        "Where do you see yourself?",
-        ["On stage / On camera", "Behind the scenes", "A bit of both"],
-        key="ent_work_style"
-    )
+        work_style = st.radio(
+            "Where do you see yourself?",
+            ["On stage / On camera", "Behind the scenes", "A bit of both"],
+            key="ent_work_style"
+        )
 
-    favorite_day = st.text_area(
-        "Describe a recent day that made you feel alive or proud:",
-        key="ent_favorite_day",
-        placeholder="Example: I helped a friend shoot a TikTok, edited clips, picked music..."
-    )
+        favorite_day = st.text_area(
+            "Describe a recent day that made you feel alive or proud:",
+            key="ent_favorite_day",
+            placeholder="Example: I helped a friend shoot a TikTok, edited clips, picked music..."
+        )
 
-    content_habits = st.text_area(
-        "What content do you enjoy making or watching?",
-        key="ent_content_habits",
-        placeholder="Example: dance reels, gaming highlights, behind-the-scenes vlogs..."
-    )
+        content_habits = st.text_area(
+            "What content do you enjoy making or watching?",
+            key="ent_content_habits",
+            placeholder="Example: dance reels, gaming highlights, behind-the-scenes vlogs..."
+        )
 
-    cols = st.columns(2)
-    with cols[0]:
-        if st.button("⬅ Back", key="ent_back_from_quiz"):
-            ent_go_to("landing")
+        submitted = st.form_submit_button("Show possible roles 🚀")
+
+    if st.button("⬅ Back", key="ent_back_from_quiz"):
+        ent_go_to("landing")
 
-    with cols[1]:
-        if st.button("Show possible roles 🚀", key="ent_show_roles"):
-            profile = f"""
+    if submitted:
+        profile = f"""
 Interests: {interests}
 Work style: {work_style}
 Favorite day: {favorite_day}
 Content habits: {content_habits}
 """
-            with st.spinner("Reading your spark and mapping it to the entertainment world…"):
-                roles = ent_generate_role_options_from_ai(profile)
+        with st.spinner("Reading your spark and mapping it to the entertainment world…"):
+            roles = ent_generate_role_options_from_ai(profile)
+            # Pre-generate every role's day simulation in one Bedrock
+            # call so "Try a day as..." clicks are instant.
+            st.session_state.ent_simulations = ent_generate_all_simulations(roles)
 
-            st.session_state.ent_role_options = roles
-            ent_go_to("roles")
+        st.session_state.ent_role_options = roles
+        ent_go_to("roles")
 
 
 def ent_show_roles():
@@ -361,60 +794,54 @@ def ent_show_roles():
 
     roles = st.session_state.ent_role_options
 
+    # Warm the simulation cache for the most likely picks in the background
+    # (covers the case where the batch pre-generation failed), so the click
+    # is usually a cache hit instead of a live Bedrock call.
+    if "ent_prefetch_submitted" not in st.session_state:
+        st.session_state.ent_prefetch_submitted = set()
+    for role in roles[:2]:
+        role_name = role["role_name"]
+        if (
+            role_name not in st.session_state.ent_simulations
+            and role_name not in st.session_state.ent_prefetch_submitted
+        ):
+            st.session_state.ent_prefetch_submitted.add(role_name)
+            _get_executor().submit(
+                _prefetch_simulation, role_name, role["why_it_fits_this_person"]
+            )
+
     if len(roles) == 0:
         st.warning("No roles yet. Go back and fill the spark quiz.")
         if st.button("Back to quiz", key="ent_roles_back_quiz"):
             ent_go_to("quiz")
         return
 
-    for idx, role in enumerate(roles, start=1):
-        role_name = role["role_name"]
-        hook = role["one_sentence_hook"]
-        why_fit = role["why_it_fits_this_person"]
+    # Build every card first and emit them in ONE st.markdown call — one
+    # Streamlit element instead of one per role.
+    cards = [
+        _ROLE_CARD.format(
+            idx=idx,
+            role_name=role["role_name"],
+            hook=role["one_sentence_hook"],
+            why_fit=role["why_it_fits_this_person"],
+        )
+        for idx, role in enumerate(roles, start=1)
+    ]
 
-        card_html = f"""
-        <div style="
-            background: radial-gradient(circle at top left, #1f2937, #020617);
-            border-radius: 18px;
-            padding: 16px 18px;
-            margin-bottom: 14px;
-            box-shadow: 0 10px 25px rgba(0,0,0,0.35);
-            border: 1px solid rgba(148,163,184,0.35);
-        ">
-            <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
-                <span style="font-size:0.8rem; opacity:0.8;">Option {idx}</span>
-                <span style="
-                    font-size:0.75rem;
-                    padding: 2px 8px;
-                    border-radius: 999px;
-                    background: rgba(96,165,250,0.15);
-                    color:#bfdbfe;
-                ">
-                    Entertainment · Creative
-                </span>
-            </div>
-            <div style="font-size: 1.05rem; font-weight: 600; margin-bottom: 4px;">
-                {role_name}
-            </div>
-            <div style="font-size: 0.92rem; opacity: 0.9; margin-bottom: 6px;">
-                {hook}
-            </div>
-            <div style="font-size: 0.85rem; opacity: 0.8;">
-                <span style="opacity:0.9; font-weight:500;">Why this fits your spark:</span> {why_fit}
-            </div>
-        </div>
-        """
-        st.markdown(card_html, unsafe_allow_html=True)
+    st.markdown(_ROLE_CARD_CSS + "\n".join(cards), unsafe_allow_html=True)
 
+    for idx, role in enumerate(roles, start=1):
+        role_name = role["role_name"]
         # 🔑 UNIQUE KEY: index + cleaned role_name
         safe_name = role_name.replace(" ", "_")
-        if st.button(
+        # on_click mutates state before the click's rerun renders, so the
+        # simulation page shows immediately without a forced extra rerun.
+        st.button(
             f"👟 Try a day as {role_name}",
-            key=f"ent_sim_{idx}_{safe_name}"
-        ):
-            st.session_state.ent_selected_role = role
-            ent_go_to("simulation")
-            st.experimental_rerun()
+            key=f"ent_sim_{idx}_{safe_name}",
+            on_click=ent_pick_role,
+            args=(role,),
+        )
 
     st.markdown("---")
     if st.button("⬅ Back to quiz", key="ent_roles_back_quiz2"):
@@ -498,44 +925,18 @@ def ent_show_simulation():
     else:
         st.caption("Think of this like a TikTok reel broken into little moments across your day.")
 
-        for i, scene in enumerate(scenes, start=1):
-            time_of_day = scene.get("time_of_day", "")
-            title = scene.get("short_title", "")
-            narration = scene.get("narration", "")
+        # One st.markdown for the whole timeline instead of one per scene.
+        scene_cards = [
+            _SCENE_CARD.format(
+                i=i,
+                time_of_day=scene.get("time_of_day", ""),
+                title=scene.get("short_title", ""),
+                narration=scene.get("narration", ""),
+            )
+            for i, scene in enumerate(scenes, start=1)
+        ]
 
-            card_html = f"""
-            <div style="
-                position: relative;
-                border-radius: 16px;
-                padding: 14px 16px 12px 16px;
-                margin-bottom: 12px;
-                background: linear-gradient(135deg, #020617, #111827);
-                border: 1px solid rgba(148,163,184,0.45);
-                box-shadow: 0 8px 20px rgba(0,0,0,0.35);
-            ">
-                <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
-                    <div style="font-size:0.78rem; opacity:0.8;">
-                        Scene {i}
-                    </div>
-                    <div style="
-                        font-size:0.78rem;
-                        padding: 2px 8px;
-                        border-radius: 999px;
-                        background: rgba(251,191,36,0.18);
-                        color:#fbbf24;
-                    ">
-                        {time_of_day}
-                    </div>
-                </div>
-                <div style="font-size:0.98rem; font-weight:600; margin-bottom:4px;">
-                    {title}
-                </div>
-                <div style="font-size:0.9rem; line-height:1.4; opacity:0.9;">
-                    {narration}
-                </div>
-            </div>
-            """
-            st.markdown(card_html, unsafe_allow_html=True)
+        st.markdown("\n".join(scene_cards), unsafe_allow_html=True)
 
     # Spark snapshot
     st.markdown("---")
@@ -646,14 +1047,15 @@ if "confidence_result" not in st.session_state:
 
 # ---- Spark Hub Bedrock Calls ----
 
-def call_identity_ai(identity_data: dict):
-    identity_json = json.dumps(identity_data, indent=2)
+# Static instruction prefixes for the two labs. They are module constants
+# so every call sends a byte-identical prefix — the requirement for Bedrock
+# prompt caching to hit. Only the small user JSON payload varies per call.
 
-    prompt = f"""
+_IDENTITY_INSTRUCTIONS = """
 You are a friendly creative-career mentor helping a young person in entertainment
 discover their "Spark Identity".
 
-You will receive:
+The user message contains JSON with:
 1) Short quiz answers about how they behave and think.
 2) Slider values for their "creative comfort zone".
 
@@ -672,10 +1074,6 @@ Your job:
 
 - Suggest 3 entertainment-related roles that fit (practical, beginner-friendly).
 
-Input data (user answers + sliders):
-
-{identity_json}
-
 Use the sliders as a 0–10 scale where:
 - chaos_structure: 0 = loves chaos, 10 = loves structure
 - solo_team: 0 = prefers solo, 10 = prefers team
@@ -686,32 +1084,111 @@ Use the sliders as a 0–10 scale where:
 
 Return ONLY a single JSON object in this exact format (no extra text):
 
-{{
+{
   "spark_archetypes": [
-    {{
+    {
       "name": "Vision Architect",
       "tagline": "You see the whole show before anyone presses record.",
       "description": "2–3 sentences in simple, encouraging language about why this archetype fits them."
-    }}
+    }
   ],
-  "creative_environment": {{
+  "creative_environment": {
     "summary": "2–3 sentences describing where they thrive.",
     "example_spaces": [
       "Example creative space 1",
       "Example creative space 2"
     ]
-  }},
+  },
   "suggested_roles": [
-    {{
+    {
       "role_name": "Assistant Creative Producer",
       "why_it_fits": "1–2 sentences connecting this role to their archetype + comfort zone."
-    }}
+    }
   ]
-}}
+}
 """
 
+
+# Fallback identities precomputed at import as a (chaos bucket, solo bucket)
+# lookup — on a Bedrock outage every user hits this path, so it should be a
+# dict read, not per-call branching and string concatenation.
+# Buckets: 0 = slider <= 3, 1 = middle, 2 = slider >= 7.
+
+def _build_fallback_identity():
+    archetypes = {
+        0: {
+            "name": "Vision Architect in Progress",
+            "tagline": "You like plans, structure, and knowing the why behind things.",
+        },
+        1: {
+            "name": "Emerging Creator",
+            "tagline": "You’re still exploring, but your creative spark is real.",
+        },
+        2: {
+            "name": "Vibe Curator in Progress",
+            "tagline": "You like energy, mood, and letting things flow.",
+        },
+    }
+    description = (
+        "Based on your answers, you enjoy playing with ideas and noticing details in your own way. "
+        "This archetype means you don’t have to have it all figured out yet — you’re in the "
+        "discovery phase, which is powerful."
+    )
+
+    base_env = (
+        "You’d likely do well in a space that gives you room to learn, experiment, "
+        "and contribute without all the pressure on you at once."
+    )
+    env_extras = {
+        0: " You might prefer roles where you can focus quietly and then share your work.",
+        1: "",
+        2: " You seem to recharge around people and might enjoy small, tight-knit creative teams.",
+    }
+
+    table = {}
+    for ck in (0, 1, 2):
+        for sk in (0, 1, 2):
+            table[ck, sk] = {
+                "spark_archetypes": [
+                    {
+                        "name": archetypes[ck]["name"],
+                        "tagline": archetypes[ck]["tagline"],
+                        "description": description,
+                    }
+                ],
+                "creative_environment": {
+                    "summary": base_env + env_extras[sk],
+                    "example_spaces": [
+                        "A small content studio where you can learn from others",
+                        "A quiet edit bay or creator corner where you can focus"
+                    ],
+                },
+                "suggested_roles": [
+                    {
+                        "role_name": "Content Assistant / Editor-in-training",
+                        "why_it_fits": "You can experiment, learn tools, and slowly take on more responsibility without needing to be perfect on day one."
+                    },
+                    {
+                        "role_name": "Production Helper on small shoots",
+                        "why_it_fits": "You’ll see many parts of the process and figure out what you like best."
+                    },
+                ],
+            }
+    return table
+
+
+_FALLBACK_IDENTITY = _build_fallback_identity()
+
+
+def _slider_bucket(value) -> int:
+    return 0 if value <= 3 else 2 if value >= 7 else 1
+
+
+def call_identity_ai(identity_data: dict):
+    identity_json = _json_dumps_sorted(identity_data)
+
     try:
-        raw = call_bedrock(prompt)
+        raw = call_bedrock_converse(_IDENTITY_INSTRUCTIONS, identity_json)
         data = safe_json_from_model(raw)
 
         if not isinstance(data, dict):
@@ -720,99 +1197,79 @@ Return ONLY a single JSON object in this exact format (no extra text):
         return data
 
     except Exception as e:
-        print("Identity Lab AI error:", repr(e))
+        logger.warning("Identity Lab AI error: %r", e)
 
         sliders = identity_data.get("sliders", {})
-        chaos_val = sliders.get("chaos_structure", 5)
-        solo_team = sliders.get("solo_team", 5)
-
-        fallback_archetype = {
-            "name": "Emerging Creator",
-            "tagline": "You’re still exploring, but your creative spark is real.",
-            "description": "Based on your answers, you enjoy playing with ideas and noticing details in your own way. This archetype means you don’t have to have it all figured out yet — you’re in the discovery phase, which is powerful."
-        }
-
-        if chaos_val >= 7:
-            fallback_archetype["name"] = "Vibe Curator in Progress"
-            fallback_archetype["tagline"] = "You like energy, mood, and letting things flow."
-        elif chaos_val <= 3:
-            fallback_archetype["name"] = "Vision Architect in Progress"
-            fallback_archetype["tagline"] = "You like plans, structure, and knowing the why behind things."
-
-        env_summary = (
-            "You’d likely do well in a space that gives you room to learn, experiment, "
-            "and contribute without all the pressure on you at once."
-        )
-
-        if solo_team >= 7:
-            env_summary += " You seem to recharge around people and might enjoy small, tight-knit creative teams."
-        elif solo_team <= 3:
-            env_summary += " You might prefer roles where you can focus quietly and then share your work."
-
-        return {
-            "spark_archetypes": [fallback_archetype],
-            "creative_environment": {
-                "summary": env_summary,
-                "example_spaces": [
-                    "A small content studio where you can learn from others",
-                    "A quiet edit bay or creator corner where you can focus"
-                ],
-            },
-            "suggested_roles": [
-                {
-                    "role_name": "Content Assistant / Editor-in-training",
-                    "why_it_fits": "You can experiment, learn tools, and slowly take on more responsibility without needing to be perfect on day one."
-                },
-                {
-                    "role_name": "Production Helper on small shoots",
-                    "why_it_fits": "You’ll see many parts of the process and figure out what you like best."
-                },
-            ],
-        }
+        ck = _slider_bucket(sliders.get("chaos_structure", 5))
+        sk = _slider_bucket(sliders.get("solo_team", 5))
+        return _FALLBACK_IDENTITY[ck, sk]
 
 
-def call_confidence_ai(conf_data: dict):
-    conf_json = json.dumps(conf_data, indent=2)
-
-    prompt = f"""
+_CONFIDENCE_INSTRUCTIONS = """
 You are a gentle but practical mentor for youth exploring entertainment careers.
 
+The user message contains JSON with their weaknesses and barriers.
+
 Your task:
 1) Take self-described "weaknesses" and reframe them into strengths that are useful in creative and entertainment work.
 2) Look at concrete barriers (like money, time, no mentorship) and suggest small, low-cost actions they can take THIS WEEK.
 3) End with a short encouragement paragraph that speaks directly to them.
 
-Input data (weaknesses + barriers):
-
-{conf_json}
-
 Output format:
 Return ONLY a single JSON object in this exact structure (no extra text):
 
-{{
+{
   "weakness_reframes": [
-    {{
+    {
       "original": "I'm shy",
       "strength": "You’re thoughtful and observant, which makes you great at noticing details others miss.",
       "example_roles": ["Video editor", "Script researcher"],
       "encouragement": "You don’t have to be loud to be powerful — quiet focus is a creative superpower."
-    }}
+    }
   ],
   "barrier_action_plan": [
-    {{
+    {
       "barrier": "Money",
       "actions": [
         "List 3 free tools (like CapCut, Canva, DaVinci Resolve) you can try this week.",
         "Ask a friend if you can borrow a phone or device for 30 minutes to create a practice clip."
       ]
-    }}
+    }
   ],
   "general_boost": "2–3 short sentences encouraging them, reminding them they are not behind, and that small steps count."
-}}
+}
 """
 
+
+# Keyword-keyed reframe templates for the confidence fallback; one
+# compiled-regex search per weakness picks the shared template, with the
+# None entry as the default when no keyword matches.
+_REFRAME_PATTERN = re.compile(r"(shy|overthink|overwhelm)", re.IGNORECASE)
+_REFRAME_MAP = {
+    "shy": {
+        "strength": "You’re observant and good at listening, which is powerful in backstage and editing roles.",
+        "example_roles": ["Video editor", "Continuity checker", "Researcher"],
+    },
+    "overthink": {
+        "strength": "You think things through, which helps with planning and quality control.",
+        "example_roles": ["Assistant producer", "Script reviewer", "Social media planner"],
+    },
+    "overwhelm": {
+        "strength": "You feel things fully, which means you notice when pacing or workload is off before others do.",
+        "example_roles": ["Production assistant", "Wellness-minded team coordinator", "Script supervisor"],
+    },
+    None: {
+        "strength": "You care deeply and notice things others might miss.",
+        "example_roles": ["Content editor", "Research assistant for shows", "Behind-the-scenes coordinator"],
+    },
+}
+
+
+def call_confidence_ai(conf_data: dict):
+    conf_json = _json_dumps_sorted(conf_data)
+
     try:
-        raw = call_bedrock(prompt)
+        raw = call_bedrock_converse(_CONFIDENCE_INSTRUCTIONS, conf_json)
         data = safe_json_from_model(raw)
 
         if not isinstance(data, dict):
@@ -821,29 +1278,21 @@ Return ONLY a single JSON object in this exact structure (no extra text):
         return data
 
     except Exception as e:
-        print("Confidence Lab AI error:", repr(e))
+        logger.warning("Confidence Lab AI error: %r", e)
 
         weaknesses = conf_data.get("weaknesses", [])
         barriers = conf_data.get("barriers", [])
         extra = conf_data.get("extra_barrier")
 
-        # Simple fallback reframes
+        # Simple fallback reframes: one regex search per weakness picks
+        # the shared template out of the precomputed map.
         reframes = []
         for w in weaknesses:
-            strength = "You care deeply and notice things others might miss."
-            roles = ["Content editor", "Research assistant for shows", "Behind-the-scenes coordinator"]
-            if "shy" in w.lower():
-                strength = "You’re observant and good at listening, which is powerful in backstage and editing roles."
-                roles = ["Video editor", "Continuity checker", "Researcher"]
-            elif "overthink" in w.lower():
-                strength = "You think things through, which helps with planning and quality control."
-                roles = ["Assistant producer", "Script reviewer", "Social media planner"]
-
+            m = _REFRAME_PATTERN.search(w)
             reframes.append(
                 {
                     "original": w,
-                    "strength": strength,
-                    "example_roles": roles,
+                    **_REFRAME_MAP[m.group(1).lower() if m else None],
                     "encouragement": "Your way of being has value — you don’t need to become someone else to contribute creatively.",
                 }
             )
@@ -872,7 +1321,56 @@ Return ONLY a single JSON object in this exact structure (no extra text):
         }
 
 
+def call_ai_batch(identity_data: dict, conf_data: dict):
+    """
+    Run the Identity and Confidence labs as two concurrent Bedrock calls
+    on the shared worker pool, so a session that fills in both labs pays
+    one round-trip latency instead of two in sequence.
+    Returns (identity_result, confidence_result).
+    """
+    executor = _get_executor()
+    identity_future = executor.submit(call_identity_ai, identity_data)
+    confidence_future = executor.submit(call_confidence_ai, conf_data)
+    return identity_future.result(), confidence_future.result()
+
+
+# Archetype card chrome is constant; only the three text fields vary.
+_ARCHETYPE_CARD = """
+<div style="
+    background: radial-gradient(circle at top left, #1f2937, #020617);
+    border-radius: 18px;
+    padding: 14px 16px;
+    margin-bottom: 12px;
+    box-shadow: 0 8px 20px rgba(0,0,0,0.35);
+    border: 1px solid rgba(148,163,184,0.5);
+">
+    <div style="font-size:0.8rem; opacity:0.8; margin-bottom:4px;">
+        Spark Archetype
+    </div>
+    <div style="font-size:1.1rem; font-weight:700; margin-bottom:4px;">
+        {name}
+    </div>
+    <div style="font-size:0.9rem; opacity:0.9; margin-bottom:4px;">
+        {tagline}
+    </div>
+    <div style="font-size:0.88rem; opacity:0.9;">
+        {desc}
+    </div>
+</div>
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _render_archetype_card(name: str, tagline: str, desc: str) -> str:
+    """Format one archetype card once per unique result, not per rerun."""
+    return _ARCHETYPE_CARD.format(name=name, tagline=tagline, desc=desc)
+
+
 def spark_main():
+    # session_state attribute access goes through __getattr__ every
+    # time; bind it once per rerun and use the local below.
+    ss = st.session_state
+
     # Header
     st.markdown(
         """
@@ -987,16 +1485,21 @@ def spark_main():
                     "bigpicture_detail": c6,
                 },
             }
-            st.session_state.identity_raw = identity_raw
+            ss.identity_raw = identity_raw
 
-            with st.spinner("Reading your spark and building your archetype + environment…"):
-                ai_result = call_identity_ai(identity_raw)
+            # Run the AI call in the background: the script finishes this
+            # rerun immediately (the rest of the page stays interactive)
+            # and the poll below picks the result up when it lands.
+            ss.identity_future = _get_executor().submit(
+                call_identity_ai, identity_raw
+            )
 
-            st.session_state.identity_result = ai_result
-            st.success("Spark Identity generated! Scroll down to see your results.")
+        identity_future = ss.get("identity_future")
+        if identity_future is not None and not identity_future.done():
+            st.info("Reading your spark and building your archetype + environment…")
 
-        if st.session_state.identity_result:
-            result = st.session_state.identity_result
+        if ss.identity_result:
+            result = ss.identity_result
 
             archetypes = result.get("spark_archetypes", [])
             env = result.get("creative_environment", {})
@@ -1008,35 +1511,17 @@ def spark_main():
             if not archetypes:
                 st.info("We couldn’t detect specific archetypes this time, but your answers still matter.")
             else:
-                for arch in archetypes:
-                    name = arch.get("name", "Spark Archetype")
-                    tagline = arch.get("tagline", "")
-                    desc = arch.get("description", "")
-
-                    card_html = f"""
-                    <div style="
-                        background: radial-gradient(circle at top left, #1f2937, #020617);
-                        border-radius: 18px;
-                        padding: 14px 16px;
-                        margin-bottom: 12px;
-                        box-shadow: 0 8px 20px rgba(0,0,0,0.35);
-                        border: 1px solid rgba(148,163,184,0.5);
-                    ">
-                        <div style="font-size:0.8rem; opacity:0.8; margin-bottom:4px;">
-                            Spark Archetype
-                        </div>
-                        <div style="font-size:1.1rem; font-weight:700; margin-bottom:4px;">
-                            {name}
-                        </div>
-                        <div style="font-size:0.9rem; opacity:0.9; margin-bottom:4px;">
-                            {tagline}
-                        </div>
-                        <div style="font-size:0.88rem; opacity:0.9;">
-                            {desc}
-                        </div>
-                    </div>
-                    """
-                    st.markdown(card_html, unsafe_allow_html=True)
+                cards = [
+                    _render_archetype_card(
+                        arch.get("name", "Spark Archetype"),
+                        arch.get("tagline", ""),
+                        arch.get("description", ""),
+                    )
+                    for arch in archetypes
+                ]
+                # Single markdown call — one element per rerun instead of
+                # one per archetype.
+                st.markdown("\n".join(cards), unsafe_allow_html=True)
 
             st.markdown("## 🌍 Your Ideal Creative Environment")
 
@@ -1072,7 +1557,7 @@ def spark_main():
                     st.markdown("---")
 
             with st.expander("See my raw answers (for coaches / mentors)"):
-                st.json(st.session_state.identity_raw)
+                st.json(ss.identity_raw)
 
     # ---- TAB 2: Confidence Lab ----
     with tab2:
@@ -1122,7 +1607,7 @@ def spark_main():
                 "barriers": barriers,
                 "extra_barrier": extra_barrier.strip() or None,
             }
-            st.session_state.confidence_raw = conf_raw
+            ss.confidence_raw = conf_raw
 
             if not weakness_list and not barriers and not extra_barrier.strip():
                 st.warning("Share at least one weakness or one barrier so we can support you.")
@@ -1130,11 +1615,11 @@ def spark_main():
                 with st.spinner("Transforming your doubts into strengths + tiny action steps…"):
                     ai_result = call_confidence_ai(conf_raw)
 
-                st.session_state.confidence_result = ai_result
+                ss.confidence_result = ai_result
                 st.success("Spark Confidence boost ready! Scroll down to see your strengths and action plan.")
 
-        if st.session_state.confidence_result:
-            result = st.session_state.confidence_result
+        if ss.confidence_result:
+            result = ss.confidence_result
 
             reframes = result.get("weakness_reframes", [])
             plans = result.get("barrier_action_plan", [])
@@ -1183,7 +1668,59 @@ def spark_main():
                 st.write(boost)
 
             with st.expander("See what you shared (for your own reflection)"):
-                st.json(st.session_state.confidence_raw)
+                st.json(ss.confidence_raw)
+
+    st.markdown("---")
+    st.caption("Filled in both labs? Run them together — the two AI calls go out at the same time.")
+
+    if st.button("Generate Both Labs ⚡", key="both_labs"):
+        identity_raw = {
+            "answers": {
+                "q1": ss.id_q1,
+                "q2": ss.id_q2,
+                "q3": ss.id_q3,
+                "q4": ss.id_q4,
+                "q5": ss.id_q5,
+                "q6": ss.id_q6,
+            },
+            "sliders": {
+                "chaos_structure": ss.id_c1,
+                "solo_team": ss.id_c2,
+                "expression_observation": ss.id_c3,
+                "logic_emotion": ss.id_c4,
+                "people_backstage": ss.id_c5,
+                "bigpicture_detail": ss.id_c6,
+            },
+        }
+        weakness_list = [w.strip() for w in ss.conf_weaknesses.split("\n") if w.strip()]
+        conf_raw = {
+            "weaknesses": weakness_list,
+            "barriers": ss.conf_barriers,
+            "extra_barrier": ss.conf_extra_barrier.strip() or None,
+        }
+
+        if not weakness_list and not ss.conf_barriers and not ss.conf_extra_barrier.strip():
+            st.warning("Fill in the Confidence Lab too (at least one weakness or barrier) to run both together.")
+        else:
+            ss.identity_raw = identity_raw
+            ss.confidence_raw = conf_raw
+            with st.spinner("Running both labs at once…"):
+                identity_result, confidence_result = call_ai_batch(identity_raw, conf_raw)
+            ss.identity_result = identity_result
+            ss.confidence_result = confidence_result
+            st.success("Both labs generated! Open each tab to see your results.")
+
+    # Poll the background identity call from the end of the script, so the
+    # whole page has already rendered (and stays interactive) between
+    # checks; no st_autorefresh dependency needed.
+    identity_future = ss.get("identity_future")
+    if identity_future is not None:
+        if identity_future.done():
+            ss.identity_result = identity_future.result()
+            ss.identity_future = None
+        else:
+            time.sleep(0.5)
+        st.rerun()
 
 
 # ============================================================
@@ -1,7 +1,14 @@
 
+import os
 import boto3
 import json
 import time
+from botocore.config import Config
+from botocore.exceptions import ClientError, ParamValidationError
+
+# Latency-optimized inference for the agent's underlying model; set
+# BEDROCK_LATENCY=standard to opt out.
+BEDROCK_LATENCY = os.environ.get("BEDROCK_LATENCY", "optimized")
 
 # -----------------------------------------
 # AWS CONFIG (YOUR VALUES)
@@ -17,26 +24,67 @@ PROFILE_TABLE = "<YOUR_DYNAMODB_PROFILE_TABLE>"
 # -----------------------------------------
 # AWS CLIENTS
 # -----------------------------------------
-bedrock = boto3.client("bedrock-agent-runtime", region_name=REGION)
-polly = boto3.client("polly", region_name=REGION)
-s3 = boto3.client("s3")
-dynamodb = boto3.resource("dynamodb")
+# Shared session + pooled config so all clients reuse credentials and
+# connections instead of each resolving them independently.
+_BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+)
+_session = boto3.session.Session()
+
+bedrock = _session.client("bedrock-agent-runtime", region_name=REGION, config=_BOTO_CONFIG)
+polly = _session.client("polly", region_name=REGION, config=_BOTO_CONFIG)
+s3 = _session.client("s3", config=_BOTO_CONFIG)
+dynamodb = _session.resource("dynamodb", config=_BOTO_CONFIG)
+
+def _latency_config_rejected(exc) -> bool:
+    """
+    True when the error means the model/region rejected the latency
+    config itself — the only case worth retrying without it. Throttling,
+    auth and transport errors must propagate, not double the call count.
+    """
+    if isinstance(exc, ParamValidationError):
+        return True
+    return (
+        isinstance(exc, ClientError)
+        and exc.response.get("Error", {}).get("Code") == "ValidationException"
+    )
+
 
 # -----------------------------------------
 # CALL MASTER AGENT (Orchestrator)
 # -----------------------------------------
 def call_master_agent(user_input: str, user_id: str):
-    response = bedrock.invoke_agent(
+    kwargs = dict(
         agentId=AGENT_ID,
         agentAliasId=ALIAS_ID,
         sessionId=user_id,
         inputText=user_input
     )
+    if BEDROCK_LATENCY != "standard":
+        kwargs["bedrockModelConfigurations"] = {"performanceConfig": {"latency": BEDROCK_LATENCY}}
+
+    try:
+        response = bedrock.invoke_agent(**kwargs)
+    except (ParamValidationError, ClientError) as e:
+        # Regions/models without latency-optimized inference reject the
+        # config — retry on the standard path.
+        if "bedrockModelConfigurations" not in kwargs or not _latency_config_rejected(e):
+            raise
+        kwargs.pop("bedrockModelConfigurations")
+        response = bedrock.invoke_agent(**kwargs)
 
-    output = ""
+    # Accumulate raw bytes and decode once at the end: per-chunk decode +
+    # str concat is quadratic in the worst case and breaks if a multibyte
+    # character is split across chunk boundaries.
+    buf = bytearray()
     for event in response["completion"]:
         if "chunk" in event:
-            output += event["chunk"]["bytes"].decode()
+            buf.extend(event["chunk"]["bytes"])
+    output = buf.decode("utf-8")
 
     save_chat_history(user_id, "user", user_input)
     save_chat_history(user_id, "agent_raw", output)
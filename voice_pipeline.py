@@ -1,15 +1,37 @@
+import codecs
 import os
+import re
 import uuid
 import wave
 import json
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, ParamValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Streaming transcription returns the transcript in hundreds of ms,
+    # with no S3 upload and no job polling. Optional dependency.
+    from amazon_transcribe.client import TranscribeStreamingClient
+except ImportError:
+    TranscribeStreamingClient = None
 
 # ------------------------------
 # AWS CONFIG
 # ------------------------------
+
+# Latency-optimized inference for the agent's underlying model; set
+# BEDROCK_LATENCY=standard to opt out.
+BEDROCK_LATENCY = os.environ.get("BEDROCK_LATENCY", "optimized")
 S3_BUCKET = "<YOUR_BUCKET_NAME>"
 REGION = "<YOUR_AWS_REGION>"
 
@@ -17,14 +39,68 @@ REGION = "<YOUR_AWS_REGION>"
 # (your console link shows us-east-2, so keep that if your agents are there)
 BEDROCK_REGION = "us-east-2"
 
-transcribe = boto3.client("transcribe", region_name=AWS_REGION)
-polly = boto3.client("polly", region_name=AWS_REGION)
-s3 = boto3.client("s3", region_name=AWS_REGION)
-bedrock_agent = boto3.client("bedrock-agent-runtime", region_name=BEDROCK_REGION)
+# One session and one connection-pool config shared by every client:
+# adaptive retries, TCP keep-alive, and enough pooled connections that the
+# Polly worker threads never block waiting for a socket.
+_BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+)
+_session = boto3.session.Session()
+
+transcribe = _session.client("transcribe", region_name=REGION, config=_BOTO_CONFIG)
+polly = _session.client("polly", region_name=REGION, config=_BOTO_CONFIG)
+s3 = _session.client("s3", region_name=REGION, config=_BOTO_CONFIG)
+bedrock_agent = _session.client(
+    "bedrock-agent-runtime", region_name=BEDROCK_REGION, config=_BOTO_CONFIG
+)
+
+
+def _json_loads(data):
+    """orjson.loads when available (3–10× faster, takes bytes directly)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _latency_config_rejected(exc) -> bool:
+    """
+    True when the error means the model/region rejected the latency
+    config itself — the only case worth retrying without it. Throttling,
+    auth and transport errors must propagate, not double the call count.
+    """
+    if isinstance(exc, ParamValidationError):
+        return True
+    return (
+        isinstance(exc, ClientError)
+        and exc.response.get("Error", {}).get("Code") == "ValidationException"
+    )
 
 
 def get_wav_duration_seconds(file_path: str) -> float:
-    """Return duration (seconds) of a WAV file."""
+    """
+    Return duration (seconds) of a WAV file.
+
+    For canonical 44-byte RIFF headers (which is what the recorder
+    produces) the duration comes straight from the header's byte rate and
+    the file size — no frame iteration. Anything with unexpected magic
+    bytes falls back to the wave module.
+    """
+    with open(file_path, "rb") as f:
+        hdr = f.read(44)
+    if (
+        len(hdr) == 44
+        and hdr[0:4] == b"RIFF"
+        and hdr[8:12] == b"WAVE"
+        and hdr[36:40] == b"data"
+    ):
+        byte_rate = int.from_bytes(hdr[28:32], "little")
+        if byte_rate > 0:
+            return (os.path.getsize(file_path) - 44) / byte_rate
+
     with wave.open(file_path, "rb") as wf:
         frames = wf.getnframes()
         rate = wf.getframerate()
@@ -39,20 +115,81 @@ def upload_to_s3(local_path: str, key_prefix: str = "uploads/") -> str:
     return f"s3://{S3_BUCKET}/{s3_key}"
 
 
+def _transcribe_streaming(local_wav_path: str) -> str:
+    """
+    Transcribe the WAV with Amazon Transcribe *streaming*: PCM frames are
+    sent in 16KB chunks and partial transcripts come back while we send,
+    so there is no S3 round-trip and no job polling at all.
+    """
+    import asyncio
+
+    with wave.open(local_wav_path, "rb") as wf:
+        # The stream is sent as mono 16-bit PCM; anything else would be
+        # transcribed garbled rather than failing, so bail out here and
+        # let the caller fall through to the batch job.
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(
+                "Streaming transcription expects mono 16-bit PCM "
+                f"(got {wf.getnchannels()}ch, {wf.getsampwidth() * 8}-bit)."
+            )
+        sample_rate = wf.getframerate()
+        pcm = wf.readframes(wf.getnframes())
+
+    async def _run() -> str:
+        client = TranscribeStreamingClient(region=REGION)
+        stream = await client.start_stream_transcription(
+            language_code="en-US",
+            media_sample_rate_hz=sample_rate,
+            media_encoding="pcm",
+        )
+
+        async def _send():
+            chunk_size = 16 * 1024
+            for i in range(0, len(pcm), chunk_size):
+                await stream.input_stream.send_audio_event(audio_chunk=pcm[i:i + chunk_size])
+            await stream.input_stream.end_stream()
+
+        pieces = []
+
+        async def _receive():
+            async for event in stream.output_stream:
+                for result in getattr(event.transcript, "results", []) or []:
+                    # Only keep finalized segments; partials get superseded.
+                    if not result.is_partial and result.alternatives:
+                        pieces.append(result.alternatives[0].transcript)
+
+        await asyncio.gather(_send(), _receive())
+        return " ".join(pieces)
+
+    return asyncio.run(_run())
+
+
 def transcribe_audio(local_wav_path: str) -> str:
     """
     Send the WAV file to Amazon Transcribe and return the text transcript.
+    Uses streaming transcription when the amazon-transcribe SDK is
+    installed; otherwise falls back to the batch job via S3.
     """
+    if TranscribeStreamingClient is not None:
+        try:
+            return _transcribe_streaming(local_wav_path).strip()
+        except Exception:
+            # Streaming can fail on odd headers or missing permissions —
+            # the batch pipeline below still works in that case.
+            pass
+
     try:
         duration = get_wav_duration_seconds(local_wav_path)
-        if duration < 0.5:
-            raise ValueError(
-                f"Audio too short ({duration:.2f}s). Please record at least 1–2 seconds."
-            )
     except Exception:
         # If duration check fails (e.g., file header weird), just skip the duration check
         duration = None
 
+    # Fail fast BEFORE the upload: a sub-0.5s clip would otherwise still
+    # pay for an S3 PUT and a Transcribe job that's doomed to fail.
+    if duration is not None and duration < 0.5:
+        raise ValueError(
+            f"Audio too short ({duration:.2f}s). Please record at least 1–2 seconds."
+        )
 
     media_uri = upload_to_s3(local_wav_path)
     job_name = f"voice-agent-{uuid.uuid4()}"
@@ -62,44 +199,51 @@ def transcribe_audio(local_wav_path: str) -> str:
         Media={"MediaFileUri": media_uri},
         MediaFormat="wav",
         LanguageCode="en-US",
-        OutputBucketName=S3_BUCKET,
     )
 
-    # Wait for the job to complete (simple polling)
+    # Wait for the job to complete. Short clips often finish within a
+    # couple of seconds, so poll with exponential backoff from 200ms
+    # (capped at 1s) instead of a flat 2s sleep — the flat sleep alone
+    # added up to ~2s of pure idle wait per turn.
+    delay = 0.2
     while True:
         job = transcribe.get_transcription_job(TranscriptionJobName=job_name)
         status = job["TranscriptionJob"]["TranscriptionJobStatus"]
         if status in ["COMPLETED", "FAILED"]:
             break
-        time.sleep(2)
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
 
     if status == "FAILED":
         raise RuntimeError(f"Transcription failed: {job}")
 
-    # Transcribe writes a JSON file with the transcript to S3.
-    # By default, the key is "<job_name>.json"
-    output_key = f"{job_name}.json"
-    obj = s3.get_object(Bucket=S3_BUCKET, Key=output_key)
-    data = json.loads(obj["Body"].read().decode("utf-8"))
+    # Without OutputBucketName, Transcribe serves the result itself via a
+    # presigned URL on the job — fetch it directly and skip the extra S3
+    # write + read round-trip.
+    transcript_uri = job["TranscriptionJob"]["Transcript"]["TranscriptFileUri"]
+    # Bounded like the boto clients (read_timeout=30) — a stalled fetch
+    # must not hang the script thread forever.
+    with urllib.request.urlopen(transcript_uri, timeout=30) as resp:
+        # No .decode() — orjson parses the raw bytes directly.
+        data = _json_loads(resp.read())
     text = data["results"]["transcripts"][0]["transcript"]
     return text.strip()
 
 
-def call_master_agent(user_text: str, session_id: str) -> str:
+def stream_master_agent(user_text: str, session_id: str):
     """
-    Call your Bedrock MASTER agent and return its text reply.
+    Call your Bedrock MASTER agent and yield its reply text chunk by
+    chunk as the event stream delivers it, so downstream work (TTS) can
+    start before the full completion has arrived.
     YOU must fill in your agentId + agentAliasId from the console.
     """
-    if not user_text:
-        return "I didn't catch that. Could you please repeat your answer?"
-
     # TODO: replace with your actual IDs from Bedrock console
-    
+
     AGENT_ID = "<YOUR_AGENT_ID>"
     AGENT_ALIAS_ID = "<YOUR_AGENT_ALIAS_ID>"
 
 
-    response = bedrock_agent.invoke_agent(
+    kwargs = dict(
         agentId=AGENT_ID,
         agentAliasId=AGENT_ALIAS_ID,
         sessionId=session_id,   # same per user to keep conversation context
@@ -107,10 +251,23 @@ def call_master_agent(user_text: str, session_id: str) -> str:
         enableTrace=False,
         endSession=False,
     )
+    if BEDROCK_LATENCY != "standard":
+        kwargs["bedrockModelConfigurations"] = {"performanceConfig": {"latency": BEDROCK_LATENCY}}
 
-    completion_text = ""
+    try:
+        response = bedrock_agent.invoke_agent(**kwargs)
+    except (ParamValidationError, ClientError) as e:
+        # Regions/models without latency-optimized inference reject the
+        # config — retry on the standard path.
+        if "bedrockModelConfigurations" not in kwargs or not _latency_config_rejected(e):
+            raise
+        kwargs.pop("bedrockModelConfigurations")
+        response = bedrock_agent.invoke_agent(**kwargs)
 
-    # completion is an event stream; usually one chunk, but we loop just in case.
+    # completion is an event stream; usually one chunk, but we loop just in
+    # case. Decode incrementally — a multibyte character split across chunk
+    # boundaries must not raise mid-stream.
+    decoder = codecs.getincrementaldecoder("utf-8")()
     for event in response.get("completion", []):
         chunk = event.get("chunk")
         if not chunk:
@@ -118,23 +275,61 @@ def call_master_agent(user_text: str, session_id: str) -> str:
         bytes_data = chunk.get("bytes")
         if not bytes_data:
             continue
-        completion_text += bytes_data.decode("utf-8")
-
-    return completion_text.strip() or "Sorry, I couldn't generate a reply this time."
+        text = decoder.decode(bytes_data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
 
 
-def synthesize_speech(text: str, output_path: str) -> str:
+def call_master_agent(user_text: str, session_id: str) -> str:
     """
-    Use Amazon Polly to turn text into speech (MP3) and save it.
+    Call your Bedrock MASTER agent and return its full text reply.
+    Thin non-streaming wrapper around stream_master_agent().
     """
+    if not user_text:
+        return "I didn't catch that. Could you please repeat your answer?"
+
+    completion_text = "".join(stream_master_agent(user_text, session_id))
+    return completion_text.strip() or "Sorry, I couldn't generate a reply this time."
+
+
+# Sentence boundary for chunked TTS — split after ./!/? plus whitespace.
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Polly calls are network-bound, so sentences of one reply can synthesize
+# in parallel instead of as one long serial request.
+_polly_pool = ThreadPoolExecutor(max_workers=4)
+
+
+def _synthesize_sentence(sentence: str) -> bytes:
     response = polly.synthesize_speech(
-        Text=text,
+        Text=sentence,
         OutputFormat="mp3",
         VoiceId="Joanna",
         Engine="neural",  # neural sounds more natural
     )
+    return response["AudioStream"].read()
+
+
+def synthesize_speech(text: str, output_path: str) -> str:
+    """
+    Use Amazon Polly to turn text into speech (MP3) and save it.
+    Multi-sentence replies are synthesized one sentence per worker and the
+    fragments written in order — MP3 frames are self-contained, so plain
+    byte concatenation plays back fine.
+    """
+    sentences = [s for s in _SENTENCE_RE.split(text) if s.strip()]
+    if len(sentences) <= 1:
+        with open(output_path, "wb") as f:
+            f.write(_synthesize_sentence(text))
+        return output_path
+
+    futures = [_polly_pool.submit(_synthesize_sentence, s) for s in sentences]
     with open(output_path, "wb") as f:
-        f.write(response["AudioStream"].read())
+        for future in futures:
+            f.write(future.result())
     return output_path
 
 
@@ -148,6 +343,36 @@ def handle_voice_interaction(
     3) reply -> voice (Polly)
     """
     user_text = transcribe_audio(local_wav_path)
-    agent_reply = call_master_agent(user_text, session_id)
-    synthesize_speech(agent_reply, output_audio_path)
+
+    if not user_text:
+        agent_reply = call_master_agent(user_text, session_id)
+        synthesize_speech(agent_reply, output_audio_path)
+        return user_text, agent_reply, output_audio_path
+
+    # Consume the agent's stream and hand each completed sentence to a
+    # Polly worker right away, so sentence 0 is synthesizing while Bedrock
+    # is still producing sentence 3.
+    pieces = []
+    futures = []
+    buffer = ""
+    for piece in stream_master_agent(user_text, session_id):
+        pieces.append(piece)
+        buffer += piece
+        parts = _SENTENCE_RE.split(buffer)
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                futures.append(_polly_pool.submit(_synthesize_sentence, sentence))
+        buffer = parts[-1]
+    if buffer.strip():
+        futures.append(_polly_pool.submit(_synthesize_sentence, buffer))
+
+    agent_reply = "".join(pieces).strip()
+    if not agent_reply:
+        agent_reply = "Sorry, I couldn't generate a reply this time."
+        futures = [_polly_pool.submit(_synthesize_sentence, agent_reply)]
+
+    with open(output_audio_path, "wb") as f:
+        for future in futures:
+            f.write(future.result())
+
     return user_text, agent_reply, output_audio_path
\ No newline at end of file